@@ -5,35 +5,107 @@ from discord.ext.commands import Cog
 from discord.utils import get
 
 from musicbot.utils.constants import ALLOWED_SOURCES, DEFAULT_VOLUME, MAX_QUEUE_LENGTH
-from musicbot.utils.embed_builder import create_song_embed, create_queue_embed, create_error_embed
+from musicbot.utils.audio_buffer import BroadcastHub
+from musicbot.utils.embed_builder import (
+    create_song_embed,
+    create_queue_embed,
+    create_error_embed,
+    create_lyrics_embeds,
+)
+from musicbot.utils.lyrics import LyricsFetchError, LyricsService
 from musicbot.utils.music_source import (
     get_youtube_info,
     get_spotify_info,
     get_soundcloud_info,
 )
+from musicbot.utils.playback import (
+    PlaybackTracker,
+    format_timestamp,
+    parse_duration,
+    parse_timestamp,
+)
 from musicbot.utils.queue import Queue
+from musicbot.utils.track_index import TrackIndex
+from musicbot.utils.youtube import search_youtube
+from musicbot.config import FFMPEG_BEFORE_OPTIONS, TRACK_INDEX_PATH
 
 class MusicCog(Cog):
     """Cog for music-related commands and functionality."""
 
     def __init__(self, bot):
         self.bot = bot
-        self.voice_client = None
-        self.queue = Queue()
-        self.current_song = None
-        self.loop_mode = False
+        self.players = {}  # {guild_id: GuildPlayer}
+        self.playback = PlaybackTracker()
+        self.broadcasts = BroadcastHub()
+        self.buffer_stats = {}  # {guild_id: {"frames": n, "underruns": n, "skipped": n}}
+        self.lyrics_service = LyricsService()
+        self.track_index = TrackIndex(TRACK_INDEX_PATH)
+
+    def get_player(self, guild_id):
+        """Returns the playback state of a guild, creating it if needed."""
+        if guild_id not in self.players:
+            self.players[guild_id] = GuildPlayer()
+        return self.players[guild_id]
+
+    async def play_autocomplete(self, ctx: discord.AutocompleteContext):
+        """Suggests previously played tracks from the local track index."""
+        return [
+            discord.OptionChoice(
+                name=f"{track['title']} - {track['artist']}"[:100], value=track["url"]
+            )
+            for track, _ in self.track_index.search(ctx.value)
+            if len(track["url"]) <= 100
+        ]
 
     @commands.command(name="play", help="Plays a song from YouTube, Spotify, or SoundCloud.")
     async def play(self, ctx, *, query):
         """Plays a song from YouTube, Spotify, or SoundCloud."""
+        await self.play_query(ctx, query)
+
+    @discord.slash_command(name="play", description="Plays a song from YouTube, Spotify, or SoundCloud.")
+    async def play_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        query: discord.Option(str, "Song name or URL", autocomplete=play_autocomplete),
+    ):
+        """Plays a song from YouTube, Spotify, or SoundCloud."""
+        await ctx.defer()
+        await self.play_query(ctx, query)
+        await ctx.delete()
+
+    async def resolve_query(self, query):
+        """Resolves a query to track information, preferring the local track index."""
+        is_supported_url = any(
+            domain in query for domain in ("youtube.com", "spotify.com", "soundcloud.com")
+        )
+        if query.startswith(("http://", "https://")) and not is_supported_url:
+            return None  # Only free text is searched, not URLs from other hosts
+
+        if is_supported_url:
+            song_info = self.track_index.get(query)
+        else:
+            song_info = self.track_index.best_match(query)
+        if song_info:
+            return song_info
+
+        if "youtube.com" in query:
+            song_info = await get_youtube_info(query)
+        elif "spotify.com" in query:
+            song_info = await get_spotify_info(query)
+        elif "soundcloud.com" in query:
+            song_info = await get_soundcloud_info(query)
+        else:
+            song_info = await search_youtube(query)
+
+        self.track_index.add(song_info)
+        return song_info
+
+    async def play_query(self, ctx, query):
+        """Resolves a query, queues the song, and starts playback if idle."""
+        player = self.get_player(ctx.guild.id)
         try:
-            if "youtube.com" in query:
-                song_info = await get_youtube_info(query)
-            elif "spotify.com" in query:
-                song_info = await get_spotify_info(query)
-            elif "soundcloud.com" in query:
-                song_info = await get_soundcloud_info(query)
-            else:
+            song_info = await self.resolve_query(query)
+            if not song_info:
                 await ctx.send(
                     embed=create_error_embed(
                         f"Invalid URL or query. Supported sources: {ALLOWED_SOURCES}"
@@ -41,7 +113,7 @@ class MusicCog(Cog):
                 )
                 return
 
-            if not self.voice_client:
+            if not player.voice_client:
                 channel = ctx.author.voice.channel
                 if not channel:
                     await ctx.send(
@@ -50,17 +122,18 @@ class MusicCog(Cog):
                         )
                     )
                     return
-                self.voice_client = await channel.connect()
+                player.voice_client = await channel.connect()
 
             song = Song(
                 title=song_info["title"],
                 artist=song_info.get("artist", "Unknown Artist"),
                 url=song_info["url"],
                 duration=song_info.get("duration", "Unknown"),
+                stream_url=song_info.get("stream_url"),
             )
-            await self.queue.add(song)
+            await player.queue.add(song)
 
-            if self.current_song is None:
+            if player.current_song is None:
                 await self.play_next_song(ctx)
 
             await ctx.send(
@@ -76,42 +149,104 @@ class MusicCog(Cog):
     @commands.command(name="skip", help="Skips the current song.")
     async def skip(self, ctx):
         """Skips the current song."""
-        if self.voice_client and self.queue:
-            self.voice_client.stop()
+        player = self.get_player(ctx.guild.id)
+        if player.voice_client and player.queue:
+            self.stop_source(ctx)
             await self.play_next_song(ctx)
             await ctx.send(embed=create_song_embed("Skipped", ""))
 
     @commands.command(name="stop", help="Stops the music and clears the queue.")
     async def stop(self, ctx):
         """Stops the music and clears the queue."""
-        if self.voice_client:
-            self.voice_client.stop()
-            await self.voice_client.disconnect()
-            self.voice_client = None
-            self.queue.clear()
-            self.current_song = None
+        player = self.get_player(ctx.guild.id)
+        if player.voice_client:
+            self.stop_source(ctx)
+            await player.voice_client.disconnect()
+            player.voice_client = None
+            player.queue.clear()
+            player.current_song = None
             await ctx.send(embed=create_error_embed("Stopped and cleared the queue."))
 
     @commands.command(name="pause", help="Pauses the current song.")
     async def pause(self, ctx):
         """Pauses the current song."""
-        if self.voice_client and self.voice_client.is_playing():
-            self.voice_client.pause()
+        player = self.get_player(ctx.guild.id)
+        if player.voice_client and player.voice_client.is_playing():
+            player.voice_client.pause()
+            self.playback.pause(ctx.guild.id)
             await ctx.send(embed=create_error_embed("Paused."))
 
     @commands.command(name="resume", help="Resumes the paused song.")
     async def resume(self, ctx):
         """Resumes the paused song."""
-        if self.voice_client and self.voice_client.is_paused():
-            self.voice_client.resume()
+        player = self.get_player(ctx.guild.id)
+        if player.voice_client and player.voice_client.is_paused():
+            player.voice_client.resume()
+            self.playback.resume(ctx.guild.id)
             await ctx.send(embed=create_error_embed("Resumed."))
 
+    @commands.command(name="seek", help="Seeks to a position in the current song.")
+    async def seek(self, ctx, position: str):
+        """Seeks to a position in the current song."""
+        try:
+            offset = parse_timestamp(position)
+        except ValueError:
+            await ctx.send(
+                embed=create_error_embed(
+                    "Invalid position. Use seconds, M:SS, or H:MM:SS."
+                )
+            )
+            return
+        await self.restart_song(ctx, offset)
+
+    @commands.command(name="replay", help="Restarts the current song from the beginning.")
+    async def replay(self, ctx):
+        """Restarts the current song from the beginning."""
+        await self.restart_song(ctx, 0)
+
+    async def restart_song(self, ctx, offset):
+        """Restarts the current song at an offset without resolving it again."""
+        player = self.get_player(ctx.guild.id)
+        if not player.voice_client or not player.current_song:
+            await ctx.send(embed=create_error_embed("No song is currently playing."))
+            return
+
+        duration = parse_duration(player.current_song.duration)
+        if duration is not None and offset >= duration:
+            await ctx.send(
+                embed=create_error_embed(
+                    f"Position must be before the end of the song ({format_timestamp(duration)})."
+                )
+            )
+            return
+
+        self.stop_source(ctx)
+        try:
+            self.start_source(ctx, offset)
+        except discord.errors.ClientException:
+            await ctx.send(
+                embed=create_error_embed(
+                    f"Error seeking in song: {player.current_song.title}"
+                )
+            )
+            # The old source is already stopped and no after callback will fire
+            player.current_song = None
+            player.current_source = None
+            await self.play_next_song(ctx)
+            return
+        await ctx.send(
+            embed=create_error_embed(
+                f"Playing '{player.current_song.title}' from {format_timestamp(offset)}."
+            )
+        )
+
     @commands.command(name="volume", help="Sets the playback volume.")
     async def volume(self, ctx, volume: float):
         """Sets the playback volume."""
-        if self.voice_client:
+        player = self.get_player(ctx.guild.id)
+        if player.voice_client:
             if 0 <= volume <= 1:
-                self.voice_client.source.volume = volume
+                player.voice_client.source.volume = volume
                 await ctx.send(embed=create_error_embed(f"Volume set to {volume:.2f}."))
             else:
                 await ctx.send(
@@ -123,31 +258,74 @@ class MusicCog(Cog):
     @commands.command(name="queue", help="Displays the current queue.")
     async def queue(self, ctx):
         """Displays the current queue."""
-        if self.queue.is_empty():
+        player = self.get_player(ctx.guild.id)
+        if player.queue.is_empty():
             await ctx.send(embed=create_error_embed("The queue is empty."))
         else:
-            await ctx.send(embed=create_queue_embed(self.queue))
+            await ctx.send(embed=create_queue_embed(player.queue))
 
     @commands.command(name="nowplaying", help="Shows information about the current song.")
     async def nowplaying(self, ctx):
         """Shows information about the current song."""
-        if self.current_song:
-            await ctx.send(
-                embed=create_song_embed(
-                    self.current_song.title,
-                    self.current_song.artist,
-                    self.current_song.url,
-                    self.current_song.duration,
-                )
+        player = self.get_player(ctx.guild.id)
+        if player.current_song:
+            embed = create_song_embed(
+                player.current_song.title,
+                player.current_song.artist,
+                player.current_song.url,
+                player.current_song.duration,
             )
+            position = self.playback.position(ctx.guild.id)
+            if position is not None:
+                embed.add_field(name="Position", value=format_timestamp(position), inline=False)
+            await ctx.send(embed=embed)
         else:
             await ctx.send(embed=create_error_embed("No song is currently playing."))
 
+    @commands.command(name="lyrics", help="Shows the lyrics of the current song.")
+    async def lyrics(self, ctx):
+        """Shows the lyrics of the current song."""
+        player = self.get_player(ctx.guild.id)
+        if not player.current_song:
+            await ctx.send(embed=create_error_embed("No song is currently playing."))
+            return
+
+        song = player.current_song
+        try:
+            lyrics = await self.lyrics_service.get(song)
+        except LyricsFetchError:
+            await ctx.send(
+                embed=create_error_embed("Could not reach the lyrics services. Please try again later.")
+            )
+            return
+        if not lyrics:
+            await ctx.send(embed=create_error_embed(f"No lyrics found for '{song.title}'."))
+            return
+        for embed in create_lyrics_embeds(song.title, song.artist, lyrics):
+            await ctx.send(embed=embed)
+
+    @commands.command(name="bufferstats", help="Shows audio buffer underrun statistics.")
+    async def bufferstats(self, ctx):
+        """Shows audio buffer underrun statistics for this server."""
+        player = self.get_player(ctx.guild.id)
+        stats = dict(self.buffer_stats.get(ctx.guild.id, {"frames": 0, "underruns": 0, "skipped": 0}))
+        if player.current_source:
+            stats["frames"] += player.current_source.frames_read
+            stats["underruns"] += player.current_source.underruns
+            stats["skipped"] += player.current_source.skipped
+        await ctx.send(
+            embed=create_error_embed(
+                f"Played {stats['frames']} frames with {stats['underruns']} underruns "
+                f"and {stats['skipped']} skipped frames."
+            )
+        )
+
     @commands.command(name="loop", help="Enables or disables song looping.")
     async def loop(self, ctx):
         """Enables or disables song looping."""
-        self.loop_mode = not self.loop_mode
-        if self.loop_mode:
+        player = self.get_player(ctx.guild.id)
+        player.loop_mode = not player.loop_mode
+        if player.loop_mode:
             await ctx.send(embed=create_error_embed("Looping enabled."))
         else:
             await ctx.send(embed=create_error_embed("Looping disabled."))
@@ -155,8 +333,9 @@ class MusicCog(Cog):
     @commands.command(name="shuffle", help="Shuffles the queue.")
     async def shuffle(self, ctx):
         """Shuffles the queue."""
-        if self.queue:
-            self.queue.shuffle()
+        player = self.get_player(ctx.guild.id)
+        if player.queue:
+            player.queue.shuffle()
             await ctx.send(embed=create_error_embed("Queue shuffled."))
         else:
             await ctx.send(embed=create_error_embed("The queue is empty."))
@@ -164,9 +343,10 @@ class MusicCog(Cog):
     @commands.command(name="remove", help="Removes a specific song from the queue.")
     async def remove(self, ctx, index: int):
         """Removes a specific song from the queue."""
-        if self.queue:
+        player = self.get_player(ctx.guild.id)
+        if player.queue:
             try:
-                song = self.queue.remove(index - 1)
+                song = player.queue.remove(index - 1)
                 await ctx.send(
                     embed=create_error_embed(
                         f"Removed '{song.title}' from the queue."
@@ -175,7 +355,7 @@ class MusicCog(Cog):
             except IndexError:
                 await ctx.send(
                     embed=create_error_embed(
-                        f"Invalid song index. Please enter a valid number between 1 and {len(self.queue)}."
+                        f"Invalid song index. Please enter a valid number between 1 and {len(player.queue)}."
                     )
                 )
         else:
@@ -184,51 +364,104 @@ class MusicCog(Cog):
     @commands.command(name="clear", help="Clears the entire queue.")
     async def clear(self, ctx):
         """Clears the entire queue."""
-        if self.queue:
-            self.queue.clear()
+        player = self.get_player(ctx.guild.id)
+        if player.queue:
+            player.queue.clear()
             await ctx.send(embed=create_error_embed("Queue cleared."))
         else:
             await ctx.send(embed=create_error_embed("The queue is empty."))
 
     async def play_next_song(self, ctx):
         """Plays the next song in the queue."""
-        if self.voice_client:
-            if self.queue.is_empty():
-                await self.voice_client.disconnect()
-                self.voice_client = None
-                self.current_song = None
+        player = self.get_player(ctx.guild.id)
+        if player.voice_client:
+            if player.queue.is_empty():
+                await player.voice_client.disconnect()
+                player.voice_client = None
+                player.current_song = None
+                player.current_source = None
+                self.playback.clear(ctx.guild.id)
                 await ctx.send(embed=create_error_embed("Queue is empty."))
                 return
 
-            self.current_song = self.queue.next()
-            if self.loop_mode:
-                await self.queue.add(self.current_song)
+            player.current_song = player.queue.next()
+            if player.loop_mode:
+                await player.queue.add(player.current_song)
 
+            # Looping and unbounded streams are radio-style: join a running broadcast live
+            is_live = parse_duration(player.current_song.duration) is None
             try:
-                self.voice_client.play(
-                    discord.FFmpegOpusAudio(self.current_song.url),
-                    after=lambda e: asyncio.run_coroutine_threadsafe(
-                        self.play_next_song(ctx), self.bot.loop
-                    ).result(),
-                )
+                self.start_source(ctx, from_start=not (player.loop_mode or is_live))
             except discord.errors.ClientException:
                 await ctx.send(
                     embed=create_error_embed(
-                        f"Error playing song: {self.current_song.title}"
+                        f"Error playing song: {player.current_song.title}"
                     )
                 )
-                self.current_song = None
-                self.queue.next()  # Move to the next song
+                player.current_song = None
+                player.queue.next()  # Move to the next song
             else:
+                self.lyrics_service.prefetch(player.current_song)
                 await ctx.send(
                     embed=create_song_embed(
-                        self.current_song.title,
-                        self.current_song.artist,
-                        self.current_song.url,
-                        self.current_song.duration,
+                        player.current_song.title,
+                        player.current_song.artist,
+                        player.current_song.url,
+                        player.current_song.duration,
                     )
                 )
-                await self.voice_client.source.volume = DEFAULT_VOLUME
+                player.voice_client.source.volume = DEFAULT_VOLUME
+
+    def start_source(self, ctx, offset=0, from_start=True):
+        """Plays the current song's stream from an offset in seconds.
+
+        Guilds playing the same stream from the same offset share one FFmpeg
+        process. With from_start, an existing broadcast is only joined while it
+        still holds its first frame; otherwise the guild joins it at its live
+        position.
+        """
+        player = self.get_player(ctx.guild.id)
+        stream_url = player.current_song.stream_url
+        before_options = FFMPEG_BEFORE_OPTIONS
+        if offset:
+            before_options += f" -ss {offset:.3f}"
+        source = self.broadcasts.subscribe(
+            stream_url,
+            offset,
+            lambda: discord.FFmpegOpusAudio(stream_url, before_options=before_options),
+            from_start=from_start,
+        )
+        player.current_source = source
+        try:
+            player.voice_client.play(
+                source,
+                after=lambda e: asyncio.run_coroutine_threadsafe(
+                    self.on_source_end(ctx, source), self.bot.loop
+                ).result(),
+            )
+        except discord.errors.ClientException:
+            source.cleanup()  # Release the broadcast subscription
+            raise
+        self.playback.start(ctx.guild.id, offset + source.position)
+
+    def stop_source(self, ctx):
+        """Stops the current source without advancing the queue."""
+        player = self.get_player(ctx.guild.id)
+        player.current_source = None
+        self.playback.clear(ctx.guild.id)
+        player.voice_client.stop()
+
+    async def on_source_end(self, ctx, source):
+        """Records buffer statistics, then advances the queue unless the source was stopped or replaced."""
+        player = self.get_player(ctx.guild.id)
+        stats = self.buffer_stats.setdefault(
+            ctx.guild.id, {"frames": 0, "underruns": 0, "skipped": 0}
+        )
+        stats["frames"] += source.frames_read
+        stats["underruns"] += source.underruns
+        stats["skipped"] += source.skipped
+        if source is player.current_source:
+            await self.play_next_song(ctx)
 
     async def cog_check(self, ctx):
         """Checks if the user is in a voice channel before executing commands."""
@@ -239,14 +472,27 @@ class MusicCog(Cog):
             return False
         return True
 
+class GuildPlayer:
+    """Represents the playback state of a single guild."""
+
+    def __init__(self):
+        self.voice_client = None
+        self.queue = Queue()
+        self.current_song = None
+        self.current_source = None
+        self.loop_mode = False
+
+
 class Song:
     """Represents a song object."""
 
-    def __init__(self, title, artist, url, duration):
+    def __init__(self, title, artist, url, duration, stream_url=None):
         self.title = title
         self.artist = artist
         self.url = url
         self.duration = duration
+        # Direct media URL when the resolver provides one, reused when seeking or replaying
+        self.stream_url = stream_url or url
 
     def __str__(self):
         return f"{self.title} by {self.artist}"
\ No newline at end of file
@@ -6,6 +6,9 @@ ALLOWED_SOURCES = ["youtube", "spotify", "soundcloud"]  # Allowed music sources
 DEFAULT_VOLUME = 0.5  # Default playback volume
 MAX_QUEUE_LENGTH = 10  # Maximum number of songs in the queue
 LOG_LEVEL = "INFO"  # Logging level
+FFMPEG_BEFORE_OPTIONS = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"  # FFmpeg input options
+OPUS_BUFFER_FRAMES = 250  # 20 ms Opus frames buffered ahead of playback (5 seconds)
+OPUS_BUFFER_PREFILL = 10  # Frames buffered before playback starts
 
 # API Keys
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
@@ -17,6 +20,16 @@ SOUNDCLOUD_CLIENT_SECRET = os.getenv("SOUNDCLOUD_CLIENT_SECRET")
 GENIUS_API_KEY = os.getenv("GENIUS_API_KEY")
 MUSICMATCH_API_KEY = os.getenv("MUSICMATCH_API_KEY")
 
+# Track Index Configuration
+TRACK_INDEX_PATH = os.getenv("TRACK_INDEX_PATH", "data/track_index.jsonl")  # On-disk track index
+TRACK_INDEX_MIN_SCORE = 0.85  # Similarity needed to skip remote providers
+TRACK_INDEX_MAX_RESULTS = 25  # Maximum autocomplete suggestions
+
+# Lyrics Configuration
+LYRICS_CACHE_SIZE = 128  # Maximum number of cached lyrics
+LYRICS_NEGATIVE_TTL = 600  # Seconds to remember that lyrics were not found
+LYRICS_PAGE_LENGTH = 2000  # Maximum characters per lyrics embed page
+
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -0,0 +1,222 @@
+import threading
+from typing import Callable, Optional
+
+import discord
+from discord.opus import OPUS_SILENCE
+
+from musicbot.config import OPUS_BUFFER_FRAMES, OPUS_BUFFER_PREFILL
+
+FRAME_DURATION = 0.02  # Seconds of audio per Opus frame
+
+
+class BroadcastProducer:
+    """Reads Opus frames from one source into a ring buffer shared by many subscribers.
+
+    A reader thread pulls encoded frames from the wrapped source into a fixed
+    number of preallocated slots, staying at most one buffer ahead of the
+    furthest subscriber. Frames are stored by reference, not copied, and every
+    subscriber keeps its own read cursor into the ring.
+    """
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        depth: int = OPUS_BUFFER_FRAMES,
+        on_stop: Optional[Callable[["BroadcastProducer"], None]] = None,
+    ):
+        if not source.is_opus():
+            raise ValueError("BroadcastProducer requires an Opus encoded source.")
+
+        self.source = source
+        self.depth = depth
+        self.on_stop = on_stop  # Called once the last subscriber has left
+        self.frames = [None] * depth  # Preallocated ring buffer slots, indexed by seq % depth
+        self.head = 0  # Sequence number of the next frame to write
+        self.subscribers = set()
+        self.started = False
+        self.finished = False  # The wrapped source is exhausted
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.reader = threading.Thread(target=self._fill, name="opus-broadcast-reader", daemon=True)
+
+    @property
+    def oldest(self) -> int:
+        """The sequence number of the oldest frame still held in the ring."""
+        return max(0, self.head - self.depth)
+
+    def _lead(self) -> int:
+        return max((subscriber.cursor for subscriber in self.subscribers), default=self.head)
+
+    def _fill(self):
+        """Reads frames from the wrapped source until it ends or the last subscriber leaves."""
+        try:
+            while True:
+                frame = self.source.read()
+                with self.condition:
+                    while self.head - self._lead() >= self.depth and not self.stopped:
+                        self.condition.wait()
+                    if self.stopped or not frame:
+                        break
+                    self.frames[self.head % self.depth] = frame
+                    self.head += 1
+                    self.condition.notify_all()
+        except Exception as e:
+            print(f"Error reading audio source: {e}")
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def subscribe(self, from_start: bool = False) -> Optional["BufferedOpusSource"]:
+        """
+        Adds a subscriber to the broadcast.
+
+        Late joiners start at the oldest frame still in the ring, so they join
+        a running broadcast close to its live position. A broadcast whose
+        source is exhausted is draining and cannot be joined.
+
+        Args:
+            from_start: Whether to refuse joining once the first frame has been dropped.
+
+        Returns:
+            A new audio source reading from the broadcast, or None if the
+            broadcast has ended or can no longer be joined from its start.
+        """
+        with self.condition:
+            if self.stopped or self.finished:
+                return None
+            if from_start and self.oldest > 0:
+                return None
+            subscriber = BufferedOpusSource(self, self.oldest)
+            self.subscribers.add(subscriber)
+            if not self.started:
+                self.started = True
+                self.reader.start()
+            return subscriber
+
+    def unsubscribe(self, subscriber: "BufferedOpusSource") -> bool:
+        """
+        Removes a subscriber, stopping the broadcast when it was the last one.
+
+        Args:
+            subscriber: The subscriber to remove.
+
+        Returns:
+            True if the broadcast was stopped, False otherwise.
+        """
+        with self.condition:
+            self.subscribers.discard(subscriber)
+            if self.subscribers or self.stopped:
+                return False
+            self.stopped = True
+            self.condition.notify_all()
+        self.source.cleanup()
+        if self.on_stop:
+            self.on_stop(self)
+        return True
+
+
+class BufferedOpusSource(discord.AudioSource):
+    """Opus audio source that plays frames buffered ahead of time by a BroadcastProducer."""
+
+    def __init__(self, producer: BroadcastProducer, cursor: int, prefill: int = OPUS_BUFFER_PREFILL):
+        self.producer = producer
+        self.cursor = cursor  # Sequence number of the next frame to play
+        self.prefill = min(prefill, producer.depth)
+        self.underruns = 0  # Reads that found no frame ready after playback started
+        self.skipped = 0  # Frames dropped after falling a whole buffer behind
+        self.frames_read = 0
+        self.closed = False
+
+    @property
+    def position(self) -> float:
+        """The number of seconds into the broadcast this subscriber has reached."""
+        return self.cursor * FRAME_DURATION
+
+    @property
+    def buffered(self) -> float:
+        """The number of seconds of audio buffered ahead of this subscriber."""
+        return max(0, self.producer.head - self.cursor) * FRAME_DURATION
+
+    def read(self) -> bytes:
+        """Returns the next buffered frame, or Opus silence if the reader has fallen behind."""
+        producer = self.producer
+        with producer.condition:
+            if self.frames_read == 0:
+                # Let the buffer fill up a little before playback starts
+                producer.condition.wait_for(
+                    lambda: producer.head - self.cursor >= self.prefill or producer.finished,
+                    timeout=self.prefill * FRAME_DURATION * 5,
+                )
+            if self.cursor >= producer.head and not producer.finished:
+                producer.condition.wait(timeout=FRAME_DURATION)
+            if self.cursor < producer.oldest:
+                self.skipped += producer.oldest - self.cursor
+                self.cursor = producer.oldest
+            if self.cursor >= producer.head:
+                if producer.finished:
+                    return b""
+                if self.frames_read:
+                    self.underruns += 1  # Startup latency is not an underrun
+                return OPUS_SILENCE
+
+            frame = producer.frames[self.cursor % producer.depth]
+            self.cursor += 1
+            self.frames_read += 1
+            producer.condition.notify_all()
+            return frame
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self):
+        """Leaves the broadcast, stopping it if this was the last subscriber."""
+        if self.closed:
+            return
+        self.closed = True
+        self.producer.unsubscribe(self)
+
+
+class BroadcastHub:
+    """Shares one BroadcastProducer per track and start position across voice clients."""
+
+    def __init__(self):
+        self.producers = {}  # {(stream_url, offset): BroadcastProducer}
+        self.lock = threading.Lock()
+
+    def subscribe(
+        self,
+        stream_url: str,
+        offset: float,
+        create_source: Callable[[], discord.AudioSource],
+        from_start: bool = False,
+    ) -> "BufferedOpusSource":
+        """
+        Subscribes to the broadcast of a track, starting one if needed.
+
+        Args:
+            stream_url: The stream URL of the track.
+            offset: The position in seconds the broadcast starts at.
+            create_source: Creates the Opus source for a new broadcast.
+            from_start: Whether the subscriber must hear the track from the offset.
+
+        Returns:
+            An audio source reading from the broadcast.
+        """
+        key = (stream_url, offset)
+        with self.lock:
+            producer = self.producers.get(key)
+            subscriber = producer.subscribe(from_start) if producer else None
+            if subscriber is None:
+                producer = BroadcastProducer(
+                    create_source(), on_stop=lambda stopped: self._remove(key, stopped)
+                )
+                self.producers[key] = producer
+                subscriber = producer.subscribe()
+        return subscriber
+
+    def _remove(self, key, producer: BroadcastProducer):
+        """Forgets a stopped broadcast unless it has already been replaced."""
+        with self.lock:
+            if self.producers.get(key) is producer:
+                del self.producers[key]
@@ -1,6 +1,7 @@
 import discord
 
 from musicbot.utils.constants import EMBED_COLOR
+from musicbot.config import LYRICS_PAGE_LENGTH
 
 def create_song_embed(title, artist, url, duration):
     """Creates a Discord embed message for displaying information about a song.
@@ -41,6 +42,39 @@ def create_queue_embed(queue):
         embed.add_field(name=f"{i+1}. {song.title}", value=f"By {song.artist}", inline=False)
     return embed
 
+def create_lyrics_embeds(title, artist, lyrics):
+    """Creates Discord embed pages for displaying the lyrics of a song.
+
+    Args:
+        title: The title of the song.
+        artist: The artist of the song.
+        lyrics: The lyrics of the song.
+
+    Returns:
+        A list of Discord embed message objects, one per page.
+    """
+    pages = [""]
+    for line in lyrics.splitlines():
+        # Leave room for the newline appended after each line
+        while len(line) > LYRICS_PAGE_LENGTH - 1:
+            pages.append(line[:LYRICS_PAGE_LENGTH - 1])
+            line = line[LYRICS_PAGE_LENGTH - 1:]
+        if len(pages[-1]) + len(line) + 1 > LYRICS_PAGE_LENGTH:
+            pages.append("")
+        pages[-1] += line + "\n"
+    pages = [page for page in pages if page.strip()]
+
+    embeds = []
+    for i, page in enumerate(pages):
+        embed = discord.Embed(
+            title=f"Lyrics: {title}",
+            description=page,
+            color=EMBED_COLOR
+        )
+        embed.set_footer(text=f"By {artist} | Page {i+1}/{len(pages)}")
+        embeds.append(embed)
+    return embeds
+
 def create_error_embed(message):
     """Creates a Discord embed message for displaying error messages.
 
@@ -0,0 +1,206 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from musicbot.config import (
+    GENIUS_API_KEY,
+    LYRICS_CACHE_SIZE,
+    LYRICS_NEGATIVE_TTL,
+    MUSICMATCH_API_KEY,
+)
+
+class LyricsFetchError(Exception):
+    """Raised when no lyrics service could be reached."""
+
+
+_TITLE_NOISE = re.compile(r"\([^)]*\)|\[[^\]]*\]|\b(official|lyrics?|video|audio|hd)\b", re.IGNORECASE)
+
+
+def _clean_title(title: str) -> str:
+    """
+    Strips bracketed and video-related noise from a track title.
+
+    Args:
+        title: The track title.
+
+    Returns:
+        The cleaned title.
+    """
+    return " ".join(_TITLE_NOISE.sub(" ", title or "").split())
+
+
+def fetch_genius_lyrics(title: str, artist: str) -> Optional[str]:
+    """
+    Retrieves lyrics from Genius by searching for the track and scraping its page.
+
+    Args:
+        title: The track title.
+        artist: The track artist.
+
+    Returns:
+        The lyrics, or None if the track is not found.
+
+    Raises:
+        requests.exceptions.RequestException: If Genius could not be reached.
+    """
+    response = requests.get(
+        "https://api.genius.com/search",
+        params={"q": f"{title} {artist}"},
+        headers={"Authorization": f"Bearer {GENIUS_API_KEY}"},
+        timeout=10,
+    )
+    response.raise_for_status()
+
+    hits = response.json().get("response", {}).get("hits", [])
+    url = hits[0].get("result", {}).get("url") if hits else None
+    if not url:
+        return None
+
+    page = requests.get(url, timeout=10)
+    page.raise_for_status()
+
+    soup = BeautifulSoup(page.content, "html.parser")
+    containers = soup.find_all("div", attrs={"data-lyrics-container": "true"})
+    lyrics = "\n".join(container.get_text("\n") for container in containers).strip()
+    return lyrics or None
+
+
+def fetch_musixmatch_lyrics(title: str, artist: str) -> Optional[str]:
+    """
+    Retrieves lyrics from the Musixmatch matcher API.
+
+    Args:
+        title: The track title.
+        artist: The track artist.
+
+    Returns:
+        The lyrics, or None if the track is not found.
+
+    Raises:
+        requests.exceptions.RequestException: If Musixmatch could not be reached.
+    """
+    response = requests.get(
+        "https://api.musixmatch.com/ws/1.1/matcher.lyrics.get",
+        params={"q_track": title, "q_artist": artist, "apikey": MUSICMATCH_API_KEY},
+        timeout=10,
+    )
+    response.raise_for_status()
+
+    body = response.json().get("message", {}).get("body")
+    if not body:
+        return None
+    lyrics = body.get("lyrics", {}).get("lyrics_body", "").strip()
+    return lyrics or None
+
+
+def fetch_lyrics(title: str, artist: str) -> Optional[str]:
+    """
+    Retrieves lyrics from Genius, falling back to Musixmatch.
+
+    Args:
+        title: The track title.
+        artist: The track artist.
+
+    Returns:
+        The lyrics, or None if neither service has them.
+
+    Raises:
+        LyricsFetchError: If no lyrics were found and a service could not be reached.
+    """
+    title = _clean_title(title)
+    if artist == "Unknown Artist":
+        artist = ""
+
+    error = None
+    for fetch in (fetch_genius_lyrics, fetch_musixmatch_lyrics):
+        try:
+            lyrics = fetch(title, artist)
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+            print(f"Error fetching lyrics with {fetch.__name__}: {e}")
+            error = e
+            continue
+        if lyrics:
+            return lyrics
+
+    if error is not None:
+        raise LyricsFetchError(str(error)) from error
+    return None
+
+
+class LyricsService:
+    """Prefetches and caches lyrics for songs."""
+
+    def __init__(self, max_size: int = LYRICS_CACHE_SIZE, negative_ttl: float = LYRICS_NEGATIVE_TTL):
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self.cache = OrderedDict()  # {song_url: (lyrics or None if not found, fetched_at)}
+        self.pending = {}  # {song_url: asyncio.Task}
+
+    def _cached(self, key: str):
+        """Returns (hit, lyrics) for a cache key, expiring stale misses."""
+        if key not in self.cache:
+            return False, None
+        lyrics, fetched_at = self.cache[key]
+        if lyrics is None and time.monotonic() - fetched_at > self.negative_ttl:
+            del self.cache[key]
+            return False, None
+        self.cache.move_to_end(key)
+        return True, lyrics
+
+    def _store(self, key: str, lyrics: Optional[str]):
+        self.cache[key] = (lyrics, time.monotonic())
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    async def _fetch(self, key: str, title: str, artist: str) -> Optional[str]:
+        # Failed fetches raise without being cached, so the next request retries
+        try:
+            lyrics = await asyncio.to_thread(fetch_lyrics, title, artist)
+            self._store(key, lyrics)
+            return lyrics
+        finally:
+            self.pending.pop(key, None)
+
+    def prefetch(self, song) -> Optional[asyncio.Task]:
+        """
+        Starts fetching the lyrics for a song in the background.
+
+        Args:
+            song: The song to fetch lyrics for.
+
+        Returns:
+            The pending fetch task, or None if the lyrics are already cached.
+        """
+        hit, _ = self._cached(song.url)
+        if hit:
+            return None
+        if song.url not in self.pending:
+            task = asyncio.create_task(self._fetch(song.url, song.title, song.artist))
+            # Mark failures of unawaited prefetches as retrieved
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self.pending[song.url] = task
+        return self.pending[song.url]
+
+    async def get(self, song) -> Optional[str]:
+        """
+        Retrieves the lyrics for a song, waiting for a pending prefetch if needed.
+
+        Args:
+            song: The song to get lyrics for.
+
+        Returns:
+            The lyrics, or None if they could not be found.
+
+        Raises:
+            LyricsFetchError: If the lyrics services could not be reached.
+        """
+        hit, lyrics = self._cached(song.url)
+        if hit:
+            return lyrics
+        return await asyncio.shield(self.prefetch(song))
@@ -0,0 +1,126 @@
+import math
+import re
+import time
+from typing import Optional
+
+MAX_TIMESTAMP = 24 * 60 * 60  # Longest position accepted, in seconds
+
+_ISO_DURATION = re.compile(r"^PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?$")
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Parses a timestamp such as "90", "1:30" or "1:02:03.5" into seconds.
+
+    Hours and minutes must be whole numbers; only the seconds field may have
+    a fraction.
+
+    Args:
+        value: The timestamp to parse.
+
+    Returns:
+        The number of seconds.
+
+    Raises:
+        ValueError: If the timestamp is malformed, negative, or too large.
+    """
+    parts = value.strip().split(":")
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f"Invalid timestamp: {value}")
+
+    *whole_parts, seconds_part = parts
+    units = [int(part) for part in whole_parts]
+    seconds = float(seconds_part)
+    if not math.isfinite(seconds) or seconds < 0 or any(unit < 0 for unit in units):
+        raise ValueError(f"Invalid timestamp: {value}")
+    if units and (seconds >= 60 or any(unit >= 60 for unit in units[1:])):
+        raise ValueError(f"Invalid timestamp: {value}")
+
+    whole = 0
+    for unit in units:
+        whole = whole * 60 + unit
+    seconds += whole * 60
+    if seconds > MAX_TIMESTAMP:
+        raise ValueError(f"Invalid timestamp: {value}")
+    return seconds
+
+
+def parse_duration(duration) -> Optional[float]:
+    """
+    Converts a duration reported by a resolver into seconds.
+
+    Spotify and SoundCloud report milliseconds, while YouTube reports ISO 8601
+    durations such as "PT3M33S".
+
+    Args:
+        duration: The duration reported by the resolver.
+
+    Returns:
+        The number of seconds, or None if the duration is unknown.
+    """
+    if isinstance(duration, (int, float)) and not isinstance(duration, bool):
+        return duration / 1000 if duration > 0 else None
+    match = _ISO_DURATION.match(str(duration or ""))
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes, seconds = (float(group or 0) for group in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def format_timestamp(seconds: float) -> str:
+    """
+    Formats a number of seconds as "M:SS" or "H:MM:SS".
+
+    Args:
+        seconds: The number of seconds.
+
+    Returns:
+        The formatted timestamp.
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class PlaybackTracker:
+    """Tracks the playback position of the current song in each guild."""
+
+    def __init__(self):
+        self.positions = {}  # {guild_id: (offset, started_at or None while paused)}
+
+    def start(self, guild_id: int, offset: float = 0.0):
+        """Records that playback started at the given offset."""
+        self.positions[guild_id] = (offset, time.monotonic())
+
+    def pause(self, guild_id: int):
+        """Freezes the playback position while the song is paused."""
+        if guild_id in self.positions:
+            self.positions[guild_id] = (self.position(guild_id), None)
+
+    def resume(self, guild_id: int):
+        """Continues advancing the playback position after a pause."""
+        if guild_id in self.positions:
+            self.positions[guild_id] = (self.position(guild_id), time.monotonic())
+
+    def clear(self, guild_id: int):
+        """Forgets the playback position of a guild."""
+        self.positions.pop(guild_id, None)
+
+    def position(self, guild_id: int) -> Optional[float]:
+        """
+        Retrieves the current playback position of a guild.
+
+        Args:
+            guild_id: The ID of the guild.
+
+        Returns:
+            The position in seconds, or None if nothing is playing.
+        """
+        if guild_id not in self.positions:
+            return None
+        offset, started_at = self.positions[guild_id]
+        if started_at is None:
+            return offset
+        return offset + time.monotonic() - started_at
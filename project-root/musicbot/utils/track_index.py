@@ -0,0 +1,218 @@
+import heapq
+import json
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from musicbot.config import TRACK_INDEX_MAX_RESULTS, TRACK_INDEX_MIN_SCORE
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _normalize(text: str) -> str:
+    """
+    Normalizes text for indexing by lowercasing it and collapsing punctuation.
+
+    Args:
+        text: The text to normalize.
+
+    Returns:
+        The normalized text.
+    """
+    return _NON_WORD.sub(" ", str(text or "").lower()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """
+    Splits normalized text into padded character trigrams.
+
+    Args:
+        text: The normalized text.
+
+    Returns:
+        A set of trigrams.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _similarity(left: Set[str], right: Set[str]) -> float:
+    """
+    Computes the Dice coefficient of two trigram sets.
+
+    Args:
+        left: The first trigram set.
+        right: The second trigram set.
+
+    Returns:
+        A score between 0 and 1.
+    """
+    if not left or not right:
+        return 0.0
+    return 2 * len(left & right) / (len(left) + len(right))
+
+
+class TrackIndex:
+    """Local prefix and fuzzy search index over previously resolved tracks."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tracks = {}  # {url: track_info}
+        self.prefixes = defaultdict(set)  # {token_prefix: {url}}
+        self.trigrams = defaultdict(set)  # {trigram: {url}}
+        self.signatures = {}  # {url: (title_trigrams, full_trigrams)}
+        self._load()
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def _load(self):
+        """Loads previously indexed tracks from disk."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self._index(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue  # Skip a truncated or corrupt line
+
+    def _index(self, track_info: Dict) -> bool:
+        """Adds a track to the in-memory index, returning False if it is already present."""
+        url = track_info["url"]
+        if not url or url in self.tracks:
+            return False
+
+        title = _normalize(track_info.get("title"))
+        full = _normalize(f"{track_info.get('title', '')} {track_info.get('artist', '')}")
+        self.tracks[url] = {
+            "title": track_info.get("title"),
+            "artist": track_info.get("artist", "Unknown Artist"),
+            "url": url,
+            "duration": track_info.get("duration", "Unknown"),
+        }
+        for token in full.split():
+            for i in range(1, len(token) + 1):
+                self.prefixes[token[:i]].add(url)
+        full_trigrams = _trigrams(full)
+        for trigram in full_trigrams:
+            self.trigrams[trigram].add(url)
+        self.signatures[url] = (_trigrams(title), full_trigrams)
+        return True
+
+    def add(self, track_info: Optional[Dict]) -> bool:
+        """
+        Adds a resolved track to the index and appends it to the on-disk log.
+
+        Args:
+            track_info: The track information returned by a resolver.
+
+        Returns:
+            True if the track was newly indexed, False otherwise.
+        """
+        if not track_info or not track_info.get("url") or not track_info.get("title"):
+            return False
+        if not track_info.get("artist") and not track_info.get("duration"):
+            return False  # Playlists and other non-track results
+        if not self._index(track_info):
+            return False
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.tracks[track_info["url"]]) + "\n")
+        except OSError as e:
+            print(f"Error writing track index: {e}")
+        return True
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Retrieves an indexed track by its URL.
+
+        Args:
+            url: The URL of the track.
+
+        Returns:
+            A dictionary containing track information, or None if the track is not indexed.
+        """
+        return self.tracks.get(url)
+
+    def _length_gap(self, url: str, query_trigrams: Set[str]) -> int:
+        """Cheap bound on the score: the closer the trigram counts, the higher the best possible score."""
+        title_trigrams, full_trigrams = self.signatures[url]
+        return min(
+            abs(len(title_trigrams) - len(query_trigrams)),
+            abs(len(full_trigrams) - len(query_trigrams)),
+        )
+
+    def _score(self, url: str, query_trigrams: Set[str]) -> float:
+        title_trigrams, full_trigrams = self.signatures[url]
+        return max(
+            _similarity(query_trigrams, title_trigrams),
+            _similarity(query_trigrams, full_trigrams),
+        )
+
+    def search(self, query: str, limit: int = TRACK_INDEX_MAX_RESULTS) -> List[Tuple[Dict, float]]:
+        """
+        Searches the index for tracks matching a query.
+
+        Tracks whose words start with every word of the query are returned first;
+        if there are none, tracks sharing trigrams with the query are used instead.
+
+        Args:
+            query: The search query.
+            limit: The maximum number of results to return.
+
+        Returns:
+            A list of (track_info, score) tuples, best match first.
+        """
+        normalized = _normalize(query)
+        if not normalized:
+            return []
+
+        candidates = None
+        for token in normalized.split():
+            matches = self.prefixes.get(token, set())
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                break
+
+        query_trigrams = _trigrams(normalized)
+        if candidates:
+            # Bound scoring work per keystroke, keeping the tracks that can score highest
+            candidates = heapq.nsmallest(
+                limit * 4, candidates, key=lambda url: self._length_gap(url, query_trigrams)
+            )
+        else:
+            counts = defaultdict(int)
+            max_postings = max(256, len(self.tracks) // 10)
+            for trigram in query_trigrams:
+                postings = self.trigrams.get(trigram, ())
+                if len(postings) > max_postings:
+                    continue  # Too common to tell tracks apart
+                for url in postings:
+                    counts[url] += 1
+            candidates = heapq.nlargest(limit * 4, counts, key=counts.get)
+
+        results = [(self.tracks[url], self._score(url, query_trigrams)) for url in candidates]
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results[:limit]
+
+    def best_match(self, query: str, min_score: float = TRACK_INDEX_MIN_SCORE) -> Optional[Dict]:
+        """
+        Finds the indexed track that matches a query with high confidence.
+
+        Args:
+            query: The search query.
+            min_score: The minimum similarity score to accept.
+
+        Returns:
+            A dictionary containing track information, or None if no track is close enough.
+        """
+        results = self.search(query)
+        if results and results[0][1] >= min_score:
+            return results[0][0]
+        return None